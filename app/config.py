@@ -1,47 +1,96 @@
 """Application configuration using environment variables."""
-from pydantic import Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
+import os
+from dataclasses import dataclass, fields
+from functools import lru_cache
 
+ENV_FILE = ".env"
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+@dataclass(slots=True, frozen=True)
+class Settings:
+    """Application settings loaded from environment variables.
+
+    Each field is read from the environment variable of the same name,
+    matched case-insensitively (e.g. ``app_name`` from ``APP_NAME``).
+    """
 
-class Settings(BaseSettings):
-    """Application settings loaded from environment variables."""
-    
     # Application Settings
-    app_name: str = Field(default="azure-monitor-demo", alias="APP_NAME")
-    app_version: str = Field(default="1.0.0", alias="APP_VERSION")
-    environment: str = Field(default="development", alias="ENVIRONMENT")
-    
+    app_name: str = "azure-monitor-demo"
+    app_version: str = "1.0.0"
+    environment: str = "development"
+
     # Server Configuration
-    host: str = Field(default="0.0.0.0", alias="HOST")
-    port: int = Field(default=8000, alias="PORT")
-    
+    host: str = "0.0.0.0"
+    port: int = 8000
+
     # Azure Monitor Configuration
-    applicationinsights_connection_string: str | None = Field(
-        default=None, 
-        alias="APPLICATIONINSIGHTS_CONNECTION_STRING"
-    )
-    applicationid: str | None = Field(
-        default=None,
-        description="Azure Application Insights Application ID"
-    )
-    
+    applicationinsights_connection_string: str | None = None
+    applicationid: str | None = None  # Azure Application Insights Application ID
+
     # OpenTelemetry Configuration
-    otel_service_name: str = Field(
-        default="fastapi-otel-azure",
-        description="OpenTelemetry service name"
-    )
-    
+    otel_enabled: bool = True
+    otel_service_name: str = "fastapi-otel-azure"
+
     # Logging Configuration
-    log_level: str = Field(default="INFO", alias="LOG_LEVEL")
-    
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        case_sensitive=False,
-        extra="ignore"  # Ignore extra fields instead of raising errors
-    )
+    log_level: str = "INFO"
+
+
+def _read_env_file(path: str) -> dict[str, str]:
+    """Parse ``[export ]KEY=value`` lines from a .env file, ignoring comments."""
+    values: dict[str, str] = {}
+    if not os.path.isfile(path):
+        return values
+    with open(path, encoding="utf-8") as env_file:
+        for line in env_file:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            if line.startswith("export "):
+                line = line[len("export "):]
+            key, _, value = line.partition("=")
+            values[key.strip().lower()] = _unquote(value.strip())
+    return values
+
+
+def _unquote(value: str) -> str:
+    """Strip matching quotes, or a trailing `` #`` comment from an unquoted value."""
+    if value[:1] in ("'", '"'):
+        end = value.find(value[0], 1)
+        if end != -1:
+            return value[1:end]
+    comment = value.find(" #")
+    if comment != -1:
+        value = value[:comment]
+    return value.strip()
+
+
+def _parse(value: str, field_type) -> object:
+    if field_type is bool:
+        normalized = value.strip().lower()
+        if normalized in _TRUE_VALUES:
+            return True
+        if normalized in _FALSE_VALUES:
+            return False
+        raise ValueError(f"Invalid boolean value: {value!r}")
+    if field_type is int:
+        return int(value)
+    return value
+
 
+def load_settings() -> Settings:
+    """Build settings from the .env file, overridden by the process environment."""
+    env = _read_env_file(ENV_FILE)
+    env.update((key.lower(), value) for key, value in os.environ.items())
+    return Settings(**{
+        field.name: _parse(env[field.name], field.type)
+        for field in fields(Settings)
+        if field.name in env
+    })
 
-# Global settings instance
-settings = Settings()
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the application settings, parsing the environment only once."""
+    return load_settings()
@@ -1,25 +1,64 @@
+import asyncio
+import itertools
 import logging
 import random
 import time
+from contextlib import asynccontextmanager
 from typing import Optional
 
-import requests
-from fastapi import FastAPI, HTTPException, Query
+import httpx
+import orjson
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from opentelemetry import metrics, trace
 
+from app.config import get_settings
 from app.telemetry import setup_telemetry
 
+
+async def _setup_telemetry_in_background(app: FastAPI):
+    """Run setup_telemetry off the event loop, logging a failure as soon as it happens."""
+    try:
+        await asyncio.to_thread(setup_telemetry, app)
+    except Exception:
+        logger.exception("OpenTelemetry setup failed; no telemetry will be exported")
+        app.state.telemetry_failed = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Configure OpenTelemetry & Azure Monitor in a background thread so the
+    server can start answering /health before the exporters are ready, and
+    hold a pooled HTTP client for the dependency demos.
+    """
+    # Load settings up front so a configuration error fails startup rather
+    # than being reported as a telemetry failure by the background task
+    get_settings()
+    app.state.telemetry_failed = False
+    app.state.telemetry_task = asyncio.create_task(_setup_telemetry_in_background(app))
+    async with httpx.AsyncClient(
+        timeout=5.0, limits=httpx.Limits(max_keepalive_connections=20)
+    ) as http:
+        app.state.http = http
+        yield
+    await app.state.telemetry_task
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="FastAPI + OpenTelemetry + Azure Monitor",
     description="Comprehensive demo showcasing all Azure Monitor telemetry types",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# Configure OpenTelemetry & Azure Monitor
-setup_telemetry(app)
+# All demo endpoints live under /demo and are included into the app below
+demo_router = APIRouter(prefix="/demo")
 
-# Get tracer and meter for custom telemetry
+# Get tracer and meter for custom telemetry. Until setup_telemetry finishes
+# these are OTel proxies, which start delegating once the providers are set.
 tracer = trace.get_tracer(__name__)
 meter = metrics.get_meter(__name__)
 
@@ -48,15 +87,69 @@ error_counter = meter.create_counter(
     unit="1",
 )
 
+# Constant metric attributes, built once instead of on every request
+ERROR_LOGGED_ATTRS = {"error_type": "logged_error", "endpoint": "/demo/error"}
+METRICS_REQUEST_ATTRS = {"endpoint": "/demo/metrics", "method": "GET"}
+METRICS_PROCESSING_ATTRS = {"operation": "demo_metrics"}
+METRICS_USERS_ATTRS = {"region": "us-east"}
+SLOW_PROCESSING_ATTRS = {"operation": "slow_operation"}
+ALL_REQUEST_ATTRS = {"endpoint": "/demo/all", "demo": "comprehensive"}
+ALL_PROCESSING_ATTRS = {"operation": "comprehensive_demo"}
+ALL_USERS_ATTRS = {"region": "demo"}
+ALL_ERROR_ATTRS = {"error_type": "simulated", "endpoint": "/demo/all"}
+HTTP_ERROR_ATTRS = {
+    400: {"error_type": "400_bad_request", "http_status": "400"},
+    401: {"error_type": "401_unauthorized", "http_status": "401"},
+    403: {"error_type": "403_forbidden", "http_status": "403"},
+    404: {"error_type": "404_not_found", "http_status": "404"},
+    429: {"error_type": "429_rate_limit", "http_status": "429"},
+    500: {"error_type": "500_server_error", "http_status": "500"},
+    503: {"error_type": "503_unavailable", "http_status": "503"},
+}
+
+# Simulated values for the demo endpoints, sampled once at import and then
+# cycled so the hot handlers only pay for a next() call
+RANDOM_RING_SIZE = 4096
+processing_times = itertools.cycle(
+    [random.uniform(10, 500) for _ in range(RANDOM_RING_SIZE)]
+)
+user_changes = itertools.cycle(random.choices([-1, 1, 2], k=RANDOM_RING_SIZE))
+data_sizes = itertools.cycle(
+    [random.randint(100, 1000) for _ in range(RANDOM_RING_SIZE)]
+)
+slow_durations = itertools.cycle(
+    [random.uniform(1, 3) for _ in range(RANDOM_RING_SIZE)]
+)
+
 # Logger
 logger = logging.getLogger(__name__)
 
-
-@app.get("/")
-async def root():
-    """Root endpoint with basic info logging."""
-    logger.info("Root endpoint accessed", extra={"user_action": "view_home"})
-    return {
+# Constant log `extra` fields, built once instead of on every request
+ROOT_LOG_EXTRA = {"user_action": "view_home"}
+INFO_LOG_EXTRA = {
+    "event_type": "user_action",
+    "action": "demo_info",
+    "user_id": "user123",
+}
+WARNING_LOG_EXTRA = {
+    "warning_type": "unusual_behavior",
+    "severity": "medium",
+    "component": "demo_service",
+}
+ERROR_LOG_EXTRA = {
+    "error_code": "ERR_001",
+    "operation": "data_processing",
+    "retry_count": 3,
+}
+ALL_STARTED_LOG_EXTRA = {"demo_id": "all_telemetry"}
+ALL_WARNING_LOG_EXTRA = {"warning_level": "informational"}
+ALL_ERROR_LOG_EXTRA = {"is_demo": True, "error_code": "DEMO_ERR"}
+HTTP_ERROR_LOG_EXTRA = {code: {"error_code": code} for code in HTTP_ERROR_ATTRS}
+
+
+# The root response never changes, so serialize it once at import
+ROOT_RESPONSE_BYTES = orjson.dumps(
+    {
         "message": "Hello from FastAPI with OpenTelemetry & Azure Monitor!",
         "endpoints": {
             "health": "/health",
@@ -84,59 +177,64 @@ async def root():
             "demo": "/demo/user-context?user_id=john_doe&action=purchase",
         },
     }
+)
+
+
+@app.get("/")
+async def root():
+    """Root endpoint with basic info logging."""
+    logger.info("Root endpoint accessed", extra=ROOT_LOG_EXTRA)
+    return Response(content=ROOT_RESPONSE_BYTES, media_type="application/json")
 
 
 @app.get("/health")
-async def health():
-    """Health check endpoint."""
+async def health(request: Request):
+    """Health check endpoint. Reports unhealthy if telemetry setup failed."""
     logger.debug("Health check performed")
-    return {"status": "healthy", "timestamp": time.time()}
+    if getattr(request.app.state, "telemetry_failed", False):
+        return Response(
+            content=orjson.dumps({"status": "unhealthy", "reason": "telemetry setup failed"}),
+            status_code=503,
+            media_type="application/json",
+        )
+    return Response(
+        content=orjson.dumps({"status": "healthy", "timestamp": time.time()}),
+        media_type="application/json",
+    )
 
 
-@app.get("/demo/info")
+@demo_router.get("/info")
 async def demo_info_log():
     """Demonstrate INFO level logging."""
     logger.info(
         "This is an informational message",
-        extra={
-            "event_type": "user_action",
-            "action": "demo_info",
-            "user_id": "user123",
-        },
+        extra=INFO_LOG_EXTRA,
     )
     return {"message": "INFO log sent to Azure Monitor"}
 
 
-@app.get("/demo/warning")
+@demo_router.get("/warning")
 async def demo_warning_log():
     """Demonstrate WARNING level logging."""
     logger.warning(
         "This is a warning message - something unusual happened",
-        extra={
-            "warning_type": "unusual_behavior",
-            "severity": "medium",
-            "component": "demo_service",
-        },
+        extra=WARNING_LOG_EXTRA,
     )
     return {"message": "WARNING log sent to Azure Monitor"}
 
 
-@app.get("/demo/error")
+@demo_router.get("/error")
 async def demo_error_log():
     """Demonstrate ERROR level logging without raising an exception."""
-    error_counter.add(1, {"error_type": "logged_error", "endpoint": "/demo/error"})
+    error_counter.add(1, ERROR_LOGGED_ATTRS)
     logger.error(
         "This is an error message - operation failed",
-        extra={
-            "error_code": "ERR_001",
-            "operation": "data_processing",
-            "retry_count": 3,
-        },
+        extra=ERROR_LOG_EXTRA,
     )
     return {"message": "ERROR log sent to Azure Monitor", "error_logged": True}
 
 
-@app.get("/demo/exception")
+@demo_router.get("/exception")
 async def demo_exception(
     error_type: Optional[str] = Query(default="runtime", description="Type of error to raise")
 ):
@@ -161,28 +259,31 @@ async def demo_exception(
         raise  # Re-raise HTTP exceptions
     except Exception as e:
         logger.exception(
-            f"Exception occurred: {type(e).__name__}",
+            "Exception occurred: %s",
+            type(e).__name__,
             extra={"error_type": error_type, "exception_class": type(e).__name__},
         )
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
 
-@app.get("/demo/metrics")
+@demo_router.get("/metrics")
 async def demo_metrics():
     """Demonstrate custom metrics (counters, histograms, gauges)."""
     # Counter
-    request_counter.add(1, {"endpoint": "/demo/metrics", "method": "GET"})
+    request_counter.add(1, METRICS_REQUEST_ATTRS)
 
     # Histogram - simulate processing time
-    processing_time = random.uniform(10, 500)
-    processing_time_histogram.record(processing_time, {"operation": "demo_metrics"})
+    processing_time = next(processing_times)
+    processing_time_histogram.record(processing_time, METRICS_PROCESSING_ATTRS)
 
     # Gauge - simulate active users
-    user_change = random.choice([-1, 1, 2])
-    active_users_gauge.add(user_change, {"region": "us-east"})
+    user_change = next(user_changes)
+    active_users_gauge.add(user_change, METRICS_USERS_ATTRS)
 
     logger.info(
-        f"Custom metrics recorded: processing_time={processing_time:.2f}ms, user_change={user_change}"
+        "Custom metrics recorded: processing_time=%.2fms, user_change=%d",
+        processing_time,
+        user_change,
     )
 
     return {
@@ -195,7 +296,7 @@ async def demo_metrics():
     }
 
 
-@app.get("/demo/trace")
+@demo_router.get("/trace")
 async def demo_custom_trace():
     """Demonstrate custom traces with spans and span attributes."""
     with tracer.start_as_current_span("custom_operation") as span:
@@ -204,16 +305,16 @@ async def demo_custom_trace():
         span.set_attribute("custom.property", "example_value")
 
         # Simulate some work
-        time.sleep(0.1)
+        await asyncio.sleep(0.1)
 
         # Create a child span
         with tracer.start_as_current_span("sub_operation") as child_span:
             child_span.set_attribute("sub_task", "data_processing")
-            time.sleep(0.05)
+            await asyncio.sleep(0.05)
             child_span.add_event("Processing started")
 
             # Simulate processing
-            data_size = random.randint(100, 1000)
+            data_size = next(data_sizes)
             child_span.set_attribute("data.size", data_size)
             child_span.add_event(
                 "Processing completed", {"records_processed": data_size}
@@ -225,7 +326,7 @@ async def demo_custom_trace():
     return {"message": "Custom trace with nested spans sent to Azure Monitor"}
 
 
-@app.get("/demo/dependency")
+@demo_router.get("/dependency")
 async def demo_dependency_tracking():
     """Demonstrate external dependency tracking (HTTP calls)."""
     with tracer.start_as_current_span("external_api_call") as span:
@@ -234,8 +335,8 @@ async def demo_dependency_tracking():
 
         try:
             # Make an external HTTP call (this will be auto-instrumented)
-            response = requests.get(
-                "https://jsonplaceholder.typicode.com/posts/1", timeout=5
+            response = await app.state.http.get(
+                "https://jsonplaceholder.typicode.com/posts/1"
             )
             span.set_attribute("http.status_code", response.status_code)
             span.set_attribute("dependency.success", True)
@@ -257,30 +358,29 @@ async def demo_dependency_tracking():
         except Exception as e:
             span.set_attribute("dependency.success", False)
             span.record_exception(e)
-            logger.error(f"External API call failed: {str(e)}")
+            logger.error("External API call failed: %s", e)
             raise HTTPException(
                 status_code=502, detail=f"External service error: {str(e)}"
             )
 
 
-@app.get("/demo/slow")
+@demo_router.get("/slow")
 async def demo_slow_operation():
     """Demonstrate performance tracking of slow operations."""
     with tracer.start_as_current_span("slow_operation") as span:
-        duration = random.uniform(1, 3)
+        duration = next(slow_durations)
         span.set_attribute("operation.duration_seconds", duration)
 
         logger.warning(
-            f"Starting slow operation (will take {duration:.2f}s)",
+            "Starting slow operation (will take %.2fs)",
+            duration,
             extra={"performance_warning": True, "expected_duration": duration},
         )
 
         # Simulate slow operation
-        time.sleep(duration)
+        await asyncio.sleep(duration)
 
-        processing_time_histogram.record(
-            duration * 1000, {"operation": "slow_operation"}
-        )
+        processing_time_histogram.record(duration * 1000, SLOW_PROCESSING_ATTRS)
 
         logger.info(
             "Slow operation completed",
@@ -294,7 +394,7 @@ async def demo_slow_operation():
         }
 
 
-@app.get("/demo/http-errors")
+@demo_router.get("/http-errors")
 async def demo_http_error_codes():
     """
     Demonstrate how different HTTP error codes appear in Azure Monitor.
@@ -317,11 +417,11 @@ async def demo_http_error_codes():
     }
 
 
-@app.get("/demo/http-errors/400")
+@demo_router.get("/http-errors/400")
 async def demo_400_error():
     """Generate a 400 Bad Request error."""
-    logger.warning("400 Bad Request error triggered", extra={"error_code": 400})
-    error_counter.add(1, {"error_type": "400_bad_request", "http_status": "400"})
+    logger.warning("400 Bad Request error triggered", extra=HTTP_ERROR_LOG_EXTRA[400])
+    error_counter.add(1, HTTP_ERROR_ATTRS[400])
     raise HTTPException(
         status_code=400,
         detail={
@@ -332,11 +432,11 @@ async def demo_400_error():
     )
 
 
-@app.get("/demo/http-errors/401")
+@demo_router.get("/http-errors/401")
 async def demo_401_error():
     """Generate a 401 Unauthorized error."""
-    logger.warning("401 Unauthorized error triggered", extra={"error_code": 401})
-    error_counter.add(1, {"error_type": "401_unauthorized", "http_status": "401"})
+    logger.warning("401 Unauthorized error triggered", extra=HTTP_ERROR_LOG_EXTRA[401])
+    error_counter.add(1, HTTP_ERROR_ATTRS[401])
     raise HTTPException(
         status_code=401,
         detail={
@@ -347,11 +447,11 @@ async def demo_401_error():
     )
 
 
-@app.get("/demo/http-errors/403")
+@demo_router.get("/http-errors/403")
 async def demo_403_error():
     """Generate a 403 Forbidden error."""
-    logger.warning("403 Forbidden error triggered", extra={"error_code": 403})
-    error_counter.add(1, {"error_type": "403_forbidden", "http_status": "403"})
+    logger.warning("403 Forbidden error triggered", extra=HTTP_ERROR_LOG_EXTRA[403])
+    error_counter.add(1, HTTP_ERROR_ATTRS[403])
     raise HTTPException(
         status_code=403,
         detail={
@@ -362,11 +462,11 @@ async def demo_403_error():
     )
 
 
-@app.get("/demo/http-errors/404")
+@demo_router.get("/http-errors/404")
 async def demo_404_error():
     """Generate a 404 Not Found error."""
-    logger.warning("404 Not Found error triggered", extra={"error_code": 404})
-    error_counter.add(1, {"error_type": "404_not_found", "http_status": "404"})
+    logger.warning("404 Not Found error triggered", extra=HTTP_ERROR_LOG_EXTRA[404])
+    error_counter.add(1, HTTP_ERROR_ATTRS[404])
     raise HTTPException(
         status_code=404,
         detail={
@@ -377,11 +477,13 @@ async def demo_404_error():
     )
 
 
-@app.get("/demo/http-errors/429")
+@demo_router.get("/http-errors/429")
 async def demo_429_error():
     """Generate a 429 Too Many Requests error."""
-    logger.warning("429 Too Many Requests error triggered", extra={"error_code": 429})
-    error_counter.add(1, {"error_type": "429_rate_limit", "http_status": "429"})
+    logger.warning(
+        "429 Too Many Requests error triggered", extra=HTTP_ERROR_LOG_EXTRA[429]
+    )
+    error_counter.add(1, HTTP_ERROR_ATTRS[429])
     raise HTTPException(
         status_code=429,
         detail={
@@ -393,11 +495,11 @@ async def demo_429_error():
     )
 
 
-@app.get("/demo/http-errors/500")
+@demo_router.get("/http-errors/500")
 async def demo_500_error():
     """Generate a 500 Internal Server Error."""
-    logger.error("500 Internal Server Error triggered", extra={"error_code": 500})
-    error_counter.add(1, {"error_type": "500_server_error", "http_status": "500"})
+    logger.error("500 Internal Server Error triggered", extra=HTTP_ERROR_LOG_EXTRA[500])
+    error_counter.add(1, HTTP_ERROR_ATTRS[500])
     
     # Simulate an actual error for more realistic tracking
     try:
@@ -415,11 +517,13 @@ async def demo_500_error():
         )
 
 
-@app.get("/demo/http-errors/503")
+@demo_router.get("/http-errors/503")
 async def demo_503_error():
     """Generate a 503 Service Unavailable error."""
-    logger.error("503 Service Unavailable error triggered", extra={"error_code": 503})
-    error_counter.add(1, {"error_type": "503_unavailable", "http_status": "503"})
+    logger.error(
+        "503 Service Unavailable error triggered", extra=HTTP_ERROR_LOG_EXTRA[503]
+    )
+    error_counter.add(1, HTTP_ERROR_ATTRS[503])
     raise HTTPException(
         status_code=503,
         detail={
@@ -431,7 +535,7 @@ async def demo_503_error():
     )
 
 
-@app.get("/demo/user-context")
+@demo_router.get("/user-context")
 async def demo_user_context(
     user_id: Optional[str] = Query(default="user123", description="User ID"),
     action: Optional[str] = Query(default="view_page", description="User action"),
@@ -445,7 +549,8 @@ async def demo_user_context(
     traces | where customDimensions.user_id == "john_doe"
     """
     logger.info(
-        f"User performed action: {action}",
+        "User performed action: %s",
+        action,
         extra={
             "user_id": user_id,
             "action": action,
@@ -462,7 +567,7 @@ async def demo_user_context(
     }
 
 
-@app.get("/demo/all")
+@demo_router.get("/all")
 async def demo_all_telemetry():
     """
     Comprehensive demo: Generate all types of telemetry in a single request.
@@ -473,47 +578,47 @@ async def demo_all_telemetry():
         results = []
 
         # 1. INFO Log
-        logger.info("Comprehensive demo started", extra={"demo_id": "all_telemetry"})
+        logger.info("Comprehensive demo started", extra=ALL_STARTED_LOG_EXTRA)
         results.append("✓ INFO log")
 
         # 2. WARNING Log
         logger.warning(
             "This is part of the comprehensive demo",
-            extra={"warning_level": "informational"},
+            extra=ALL_WARNING_LOG_EXTRA,
         )
         results.append("✓ WARNING log")
 
         # 3. Metrics
-        request_counter.add(1, {"endpoint": "/demo/all", "demo": "comprehensive"})
-        processing_time_histogram.record(250, {"operation": "comprehensive_demo"})
-        active_users_gauge.add(1, {"region": "demo"})
+        request_counter.add(1, ALL_REQUEST_ATTRS)
+        processing_time_histogram.record(250, ALL_PROCESSING_ATTRS)
+        active_users_gauge.add(1, ALL_USERS_ATTRS)
         results.append("✓ Custom metrics (counter, histogram, gauge)")
 
         # 4. Custom span with events
         with tracer.start_as_current_span("demo_sub_operation") as sub_span:
             sub_span.add_event("Sub-operation started")
-            time.sleep(0.1)
+            await asyncio.sleep(0.1)
             sub_span.set_attribute("records_processed", 42)
             sub_span.add_event("Sub-operation completed")
         results.append("✓ Custom nested trace")
 
         # 5. Dependency call
         try:
-            response = requests.get(
-                "https://jsonplaceholder.typicode.com/users/1", timeout=5
+            response = await app.state.http.get(
+                "https://jsonplaceholder.typicode.com/users/1"
             )
             span.set_attribute("dependency.called", True)
             results.append(f"✓ Dependency tracking (status: {response.status_code})")
         except Exception as e:
-            logger.error(f"Dependency call failed: {str(e)}")
+            logger.error("Dependency call failed: %s", e)
             results.append("✗ Dependency tracking (failed)")
 
         # 6. ERROR Log (without exception)
         logger.error(
             "Simulated error for demo purposes",
-            extra={"is_demo": True, "error_code": "DEMO_ERR"},
+            extra=ALL_ERROR_LOG_EXTRA,
         )
-        error_counter.add(1, {"error_type": "simulated", "endpoint": "/demo/all"})
+        error_counter.add(1, ALL_ERROR_ATTRS)
         results.append("✓ ERROR log")
 
         # 7. Exception handling (caught)
@@ -537,11 +642,15 @@ async def demo_all_telemetry():
         }
 
 
+app.include_router(demo_router)
+
+
 # Global exception handler to track unhandled exceptions
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.exception(
-        f"Unhandled exception on {request.url.path}",
+        "Unhandled exception on %s",
+        request.url.path,
         extra={"path": request.url.path, "method": request.method},
     )
     return {
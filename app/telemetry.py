@@ -1,34 +1,51 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
-from azure.monitor.opentelemetry import configure_azure_monitor
-from azure.monitor.opentelemetry.exporter import (
-    AzureMonitorLogExporter,
-    AzureMonitorMetricExporter,
-    AzureMonitorTraceExporter,
-)
-from opentelemetry import metrics, trace
-from opentelemetry._logs import set_logger_provider
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.logging import LoggingInstrumentor
-from opentelemetry.instrumentation.requests import RequestsInstrumentor
-from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler
-from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
-from opentelemetry.sdk.metrics import MeterProvider
-from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
-from opentelemetry.sdk.resources import SERVICE_NAME, Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-
-from app.config import settings
+from app.config import get_settings
+
+# Batch export tuning shared by the span and log processors: a larger queue
+# and a longer delay than the SDK defaults (2048 / 5s) mean fewer exporter
+# wake-ups and bigger payloads per request to the ingestion endpoint.
+BATCH_PROCESSOR_OPTIONS = {
+    "max_queue_size": 4096,
+    "max_export_batch_size": 512,
+    "schedule_delay_millis": 15000,
+}
+
+# Providers can only be set once per process, so repeated lifespans (e.g.
+# several test client sessions) must not run the setup again
+_telemetry_configured = False
+
+
+@contextmanager
+def _timed(phases: dict[str, float], name: str):
+    """Record the wall-clock duration of a setup phase in milliseconds."""
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        phases[name] = (time.perf_counter_ns() - start) / 1e6
 
 
 def setup_telemetry(app) -> None:
     """
     Configure OpenTelemetry tracing, metrics, and logging for FastAPI and Azure Monitor.
+    Safe to call more than once; only the first successful call configures anything.
     """
+    global _telemetry_configured
+    if _telemetry_configured:
+        return
+
+    settings = get_settings()
     connection_string = settings.applicationinsights_connection_string
     service_name = settings.otel_service_name or settings.app_name
 
+    if not settings.otel_enabled:
+        logging.warning("OTEL_ENABLED is false. Skipping OpenTelemetry setup.")
+        return
+
     if not connection_string:
         # Basic warning - still allow app to run without telemetry
         logging.warning(
@@ -37,6 +54,29 @@ def setup_telemetry(app) -> None:
         )
         return
 
+    phases: dict[str, float] = {}
+    setup_start = time.perf_counter_ns()
+
+    # Imported here so deployments with telemetry disabled don't pay for the
+    # Azure exporter and OpenTelemetry SDK imports
+    with _timed(phases, "imports"):
+        from azure.monitor.opentelemetry.exporter import (
+            AzureMonitorLogExporter,
+            AzureMonitorMetricExporter,
+            AzureMonitorTraceExporter,
+        )
+        from opentelemetry import metrics, trace
+        from opentelemetry._logs import set_logger_provider
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+        from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+        from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler
+        from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+        from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
     # Resource describing this service
     resource = Resource(attributes={
         SERVICE_NAME: service_name,
@@ -45,51 +85,73 @@ def setup_telemetry(app) -> None:
     })
 
     # ========== TRACES ==========
-    tracer_provider = TracerProvider(resource=resource)
-    trace.set_tracer_provider(tracer_provider)
+    with _timed(phases, "traces"):
+        tracer_provider = TracerProvider(resource=resource)
+        trace.set_tracer_provider(tracer_provider)
 
-    trace_exporter = AzureMonitorTraceExporter.from_connection_string(
-        connection_string
-    )
-    span_processor = BatchSpanProcessor(trace_exporter)
-    tracer_provider.add_span_processor(span_processor)
+        trace_exporter = AzureMonitorTraceExporter.from_connection_string(
+            connection_string
+        )
+        span_processor = BatchSpanProcessor(trace_exporter, **BATCH_PROCESSOR_OPTIONS)
+        tracer_provider.add_span_processor(span_processor)
 
     # ========== METRICS ==========
-    metric_reader = PeriodicExportingMetricReader(
-        AzureMonitorMetricExporter.from_connection_string(connection_string)
-    )
-    meter_provider = MeterProvider(resource=resource, metric_readers=[metric_reader])
-    metrics.set_meter_provider(meter_provider)
-
-    # Configure Azure Monitor for live metrics
-    configure_azure_monitor(
-        connection_string=connection_string,
-        enable_live_metrics=True,
-        logger_name="app.main",
-    )
+    with _timed(phases, "metrics"):
+        metric_reader = PeriodicExportingMetricReader(
+            AzureMonitorMetricExporter.from_connection_string(connection_string)
+        )
+        meter_provider = MeterProvider(resource=resource, metric_readers=[metric_reader])
+        metrics.set_meter_provider(meter_provider)
 
     # ========== LOGS ==========
-    logger_provider = LoggerProvider(resource=resource)
-    set_logger_provider(logger_provider)
+    with _timed(phases, "logs"):
+        logger_provider = LoggerProvider(resource=resource)
+        set_logger_provider(logger_provider)
 
-    log_exporter = AzureMonitorLogExporter.from_connection_string(connection_string)
-    logger_provider.add_log_record_processor(BatchLogRecordProcessor(log_exporter))
+        log_exporter = AzureMonitorLogExporter.from_connection_string(connection_string)
+        logger_provider.add_log_record_processor(
+            BatchLogRecordProcessor(log_exporter, **BATCH_PROCESSOR_OPTIONS)
+        )
 
-    # Attach OTEL handler to root logger
-    handler = LoggingHandler(level=logging.NOTSET, logger_provider=logger_provider)
-    logging.getLogger().addHandler(handler)
-    logging.getLogger().setLevel(logging.INFO)
+        # Attach OTEL handler to root logger
+        handler = LoggingHandler(level=logging.NOTSET, logger_provider=logger_provider)
+        logging.getLogger().addHandler(handler)
+        logging.getLogger().setLevel(logging.INFO)
 
     # ========== INSTRUMENTATION ==========
-    # Instrument FastAPI
-    FastAPIInstrumentor.instrument_app(app, tracer_provider=tracer_provider)
-
-    # Instrument requests library for external HTTP calls
-    RequestsInstrumentor().instrument()
-
-    # Instrument logging so logs are correlated with traces
-    LoggingInstrumentor().instrument(set_logging_format=True)
-
-    logging.getLogger(__name__).info(
-        f"OpenTelemetry with Azure Monitor configured for {service_name}"
+    def instrument_fastapi() -> None:
+        with _timed(phases, "fastapi"):
+            FastAPIInstrumentor.instrument_app(app, tracer_provider=tracer_provider)
+            # Setup runs from the lifespan, after Starlette has already built
+            # the middleware stack, so rebuild it to pick up the OTel middleware
+            app.middleware_stack = app.build_middleware_stack()
+
+    def instrument_httpx() -> None:
+        with _timed(phases, "httpx"):
+            HTTPXClientInstrumentor().instrument()
+
+    # The instrumentors patch unrelated libraries, so run them side by side:
+    # FastAPI, and httpx for external HTTP calls. Logging is not instrumented:
+    # the LoggingHandler above already stamps each record with the active
+    # span's trace context, so rewriting the log format adds nothing.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(instrument_fastapi),
+            executor.submit(instrument_httpx),
+        ]
+        for future in futures:
+            future.result()
+
+    # Set only once everything succeeded, so a failed setup is retried by the
+    # next lifespan
+    _telemetry_configured = True
+
+    phases["total"] = (time.perf_counter_ns() - setup_start) / 1e6
+
+    logger = logging.getLogger(__name__)
+    logger.info(
+        "OpenTelemetry with Azure Monitor configured for %s", service_name
     )
+    # Startup breakdown, to show which phase dominates cold-start time
+    for name, elapsed_ms in phases.items():
+        logger.info("otel.init.%s_ms=%.2f", name, elapsed_ms)
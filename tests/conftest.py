@@ -0,0 +1,48 @@
+import os
+
+# Keep tests from exporting to Azure Monitor, even if .env holds a real
+# connection string. Must run before the app settings are first loaded.
+os.environ.setdefault("OTEL_ENABLED", "false")
+
+import httpx
+import pytest
+import pytest_asyncio
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runslow",
+        action="store_true",
+        default=False,
+        help="also run the full /demo/all integration test",
+    )
+
+
+@pytest.fixture(scope="session")
+def app_instance():
+    """
+    The FastAPI app, imported on first use rather than at collection time so
+    `--collect-only`, `-k` and xdist worker start-up don't pay for it.
+    """
+    from app.main import app
+
+    return app
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def aclient(app_instance):
+    """
+    The one client for the whole session. It runs the app lifespan once on the
+    session event loop, so ``app.state.http`` is created, used and closed on
+    that same loop.
+    """
+    async with app_instance.router.lifespan_context(app_instance):
+        transport = httpx.ASGITransport(app=app_instance)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def slow_response(aclient):
+    """Response from /demo/slow, fetched once so its sleep is paid once per session."""
+    return await aclient.get("/demo/slow")
@@ -1,12 +1,15 @@
 """
 Load testing script for Azure Monitor demo.
 Generates random requests to various endpoints including error codes.
+Requests are fanned out concurrently, bounded by a semaphore.
 """
+import asyncio
+import math
 import random
 import sys
-import time
+from collections import defaultdict
 
-import requests
+import httpx
 
 BASE_URL = "http://localhost:8000"
 
@@ -26,53 +29,75 @@ ENDPOINTS = [
 ]
 
 
-def run_load_test(iterations: int = 20):
-    """Run load test with specified number of iterations."""
-    print("\n🚀 Starting load test...\n")
-    
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+async def run_load_test(iterations: int = 20, concurrency: int = 50):
+    """Run load test with specified number of iterations and concurrency."""
+    print(f"\n🚀 Starting load test ({concurrency} concurrent)...\n")
+
     success_count = 0
     error_count = 0
-    
-    for i in range(iterations):
+    latencies_ms: dict[str, list[float]] = defaultdict(list)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(client: httpx.AsyncClient, i: int):
+        nonlocal success_count, error_count
         endpoint = random.choice(ENDPOINTS)
-        try:
-            response = requests.get(f"{BASE_URL}{endpoint}", timeout=10)
-            
-            if response.status_code < 400:
-                success_count += 1
-                print(f"✅ Request {i+1}/{iterations}: {endpoint} → {response.status_code}")
-            else:
+        async with semaphore:
+            try:
+                response = await client.get(f"{BASE_URL}{endpoint}")
+            except httpx.HTTPError as e:
                 error_count += 1
-                print(f"❌ Request {i+1}/{iterations}: {endpoint} → {response.status_code}")
-        
-        except requests.exceptions.RequestException as e:
+                print(f"❌ Request {i+1}/{iterations}: {endpoint} → Error: {str(e)}")
+                return
+
+        latencies_ms[endpoint].append(response.elapsed.total_seconds() * 1000)
+        if response.status_code < 400:
+            success_count += 1
+            print(f"✅ Request {i+1}/{iterations}: {endpoint} → {response.status_code}")
+        else:
             error_count += 1
-            print(f"❌ Request {i+1}/{iterations}: {endpoint} → Error: {str(e)}")
-        
-        time.sleep(0.2)  # Small delay between requests
-    
+            print(f"❌ Request {i+1}/{iterations}: {endpoint} → {response.status_code}")
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(timeout=10, limits=limits) as client:
+        await asyncio.gather(*(one(client, i) for i in range(iterations)))
+
     print(f"\n📊 Load Test Results:")
     print(f"   Total: {iterations} requests")
     print(f"   ✅ Successful: {success_count}")
     print(f"   ❌ Errors: {error_count}")
     print(f"   📈 Error Rate: {(error_count/iterations)*100:.1f}%")
+
+    print(f"\n⏱️  Latency by endpoint (ms):")
+    print(f"   {'Endpoint':<26}{'Count':>7}{'p50':>10}{'p95':>10}{'Max':>10}")
+    for endpoint in sorted(latencies_ms):
+        values = sorted(latencies_ms[endpoint])
+        print(
+            f"   {endpoint:<26}{len(values):>7}"
+            f"{percentile(values, 50):>10.1f}"
+            f"{percentile(values, 95):>10.1f}"
+            f"{values[-1]:>10.1f}"
+        )
     print(f"\n💡 Check Azure Portal in 2-5 minutes to see the telemetry!\n")
 
 
 if __name__ == "__main__":
     # Check if server is running
     try:
-        requests.get(f"{BASE_URL}/health", timeout=5)
+        httpx.get(f"{BASE_URL}/health", timeout=5)
         print(f"✓ Server is running at {BASE_URL}")
-    except:
+    except httpx.HTTPError:
         print(f"✗ Server is not running at {BASE_URL}")
         print(f"Please start it with: docker-compose up -d\n")
         sys.exit(1)
-    
-    # Get number of iterations
-    if len(sys.argv) > 1:
-        iterations = int(sys.argv[1])
-    else:
-        iterations = 20
-    
-    run_load_test(iterations)
+
+    # Get number of iterations and concurrency
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    asyncio.run(run_load_test(iterations, concurrency))
@@ -0,0 +1,85 @@
+from dataclasses import fields
+
+import pytest
+
+from app import config
+from app.config import Settings, load_settings
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    """Point the settings at a temporary .env file with no overriding env vars."""
+    for field in fields(Settings):
+        monkeypatch.delenv(field.name.upper(), raising=False)
+    path = tmp_path / ".env"
+    monkeypatch.setattr(config, "ENV_FILE", str(path))
+
+    def write(text: str):
+        path.write_text(text, encoding="utf-8")
+
+    return write
+
+
+def test_defaults_without_env_file(env_file):
+    """Without a .env file or env vars every field keeps its default."""
+    assert load_settings() == Settings()
+
+
+def test_environment_overrides_env_file(env_file, monkeypatch):
+    """Process environment variables win over the .env file."""
+    env_file("APP_NAME=from-file\nENVIRONMENT=staging\n")
+    monkeypatch.setenv("APP_NAME", "from-env")
+    settings = load_settings()
+    assert settings.app_name == "from-env"
+    assert settings.environment == "staging"
+
+
+def test_names_are_case_insensitive(env_file, monkeypatch):
+    """Variable names match fields regardless of case."""
+    env_file("Log_Level=DEBUG\n")
+    monkeypatch.setenv("otel_service_name", "lower-case")
+    settings = load_settings()
+    assert settings.log_level == "DEBUG"
+    assert settings.otel_service_name == "lower-case"
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [("1", True), ("true", True), ("Yes", True), (" on ", True),
+     ("0", False), ("false", False), ("NO", False), ("off", False)],
+)
+def test_bool_parsing(env_file, monkeypatch, value, expected):
+    """Boolean fields accept the usual true/false spellings."""
+    monkeypatch.setenv("OTEL_ENABLED", value)
+    assert load_settings().otel_enabled is expected
+
+
+def test_int_parsing(env_file):
+    """Integer fields are converted from strings."""
+    env_file("PORT=9000\n")
+    assert load_settings().port == 9000
+
+
+@pytest.mark.parametrize("name,value", [("OTEL_ENABLED", "ture"), ("PORT", "eighty")])
+def test_invalid_values_raise(env_file, monkeypatch, name, value):
+    """Unparseable booleans and integers are rejected, not defaulted."""
+    monkeypatch.setenv(name, value)
+    with pytest.raises(ValueError):
+        load_settings()
+
+
+def test_env_file_syntax(env_file):
+    """Quotes, comments and ``export`` prefixes are handled like python-dotenv."""
+    env_file(
+        "# comment\n"
+        "\n"
+        "APP_NAME='single quoted'\n"
+        'ENVIRONMENT="double # quoted" # trailing comment\n'
+        "APPLICATIONINSIGHTS_CONNECTION_STRING=InstrumentationKey=abc;IngestionEndpoint=x # prod key\n"
+        "export LOG_LEVEL=DEBUG\n"
+    )
+    settings = load_settings()
+    assert settings.app_name == "single quoted"
+    assert settings.environment == "double # quoted"
+    assert settings.applicationinsights_connection_string == "InstrumentationKey=abc;IngestionEndpoint=x"
+    assert settings.log_level == "DEBUG"
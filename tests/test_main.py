@@ -1,110 +1,167 @@
-from app.main import app
-from fastapi.testclient import TestClient
-
-client = TestClient(app)
-
-
-def test_root():
-    """Test root endpoint returns message and endpoints list."""
-    response = client.get("/")
+import asyncio
+import logging
+from unittest.mock import ANY
+
+import httpx
+import pytest
+import respx
+
+pytestmark = [
+    # Async tests share the session event loop that the session-scoped
+    # aclient and its app lifespan run on
+    pytest.mark.asyncio(loop_scope="session"),
+    # With `-n auto --dist=loadgroup`, keep every test in this module on one
+    # xdist worker so they share that worker's session-scoped app and client
+    pytest.mark.xdist_group("fastapi_client"),
+]
+
+
+@pytest.mark.parametrize(
+    "path,needle,expected",
+    [
+        ("/", None, {"message": ANY, "endpoints": ANY}),
+        ("/health", None, {"status": "healthy"}),
+        ("/demo/info", "INFO log", None),
+        ("/demo/warning", "WARNING log", None),
+        ("/demo/error", "ERROR log", {"message": ANY, "error_logged": True}),
+        ("/demo/trace", "Custom trace", None),
+        (
+            "/demo/metrics",
+            None,
+            {"metrics": {"request_count": "+1", "processing_time_ms": ANY, "active_users_change": ANY}},
+        ),
+    ],
+)
+async def test_simple_get(aclient, path, needle, expected):
+    """Test simple GET endpoints return 200 with the expected values and text."""
+    response = await aclient.get(path)
     assert response.status_code == 200
-    data = response.json()
-    assert "message" in data
-    assert "endpoints" in data
-
-
-def test_health():
-    """Test health endpoint returns healthy status."""
-    response = client.get("/health")
+    if needle is not None:
+        assert needle.encode() in response.content
+    # Only parse the body for cases that check structured values
+    if expected is not None:
+        data = response.json()
+        for key, value in expected.items():
+            assert data[key] == value
+
+
+@pytest.mark.parametrize(
+    "error_type,status",
+    [("runtime", 500), ("http", 503), ("zero_division", 500)],
+)
+async def test_demo_exception(aclient, error_type, status):
+    """Test exception endpoint for each simulated error type."""
+    response = await aclient.get(f"/demo/exception?error_type={error_type}")
+    assert response.status_code == status
+    if status == 500:
+        assert "error" in response.json()["detail"].lower()
+
+
+async def test_demo_dependency_tracking(aclient):
+    """Test dependency tracking endpoint against a mocked external API."""
+    post = {"id": 1, "title": "mocked post"}
+    with respx.mock:
+        route = respx.get("https://jsonplaceholder.typicode.com/posts/1").respond(
+            200, json=post
+        )
+        response = await aclient.get("/demo/dependency")
+    assert route.called
     assert response.status_code == 200
-    assert response.json()["status"] == "healthy"
+    data = response.json()
+    assert data["external_api"] == "jsonplaceholder.typicode.com"
+    assert data["data"] == post
 
 
-def test_demo_info_log():
-    """Test INFO log demo endpoint."""
-    response = client.get("/demo/info")
-    assert response.status_code == 200
-    assert "INFO log" in response.json()["message"]
-
+@pytest.mark.slow
+async def test_demo_slow_operation(slow_response):
+    """Test slow operation endpoint."""
+    assert slow_response.status_code == 200
+    data = slow_response.json()
+    assert "duration_seconds" in data
+    assert data["duration_seconds"] > 0
 
-def test_demo_warning_log():
-    """Test WARNING log demo endpoint."""
-    response = client.get("/demo/warning")
-    assert response.status_code == 200
-    assert "WARNING log" in response.json()["message"]
 
+@pytest.mark.slow
+async def test_demo_all_telemetry(aclient, request):
+    """Test comprehensive demo endpoint that generates all telemetry types."""
+    # /demo/all only re-exercises the endpoints tested above; the route check
+    # below covers it by default, and this full run is kept for --runslow (CI)
+    if not request.config.getoption("--runslow"):
+        pytest.skip("full /demo/all run only with --runslow")
 
-def test_demo_error_log():
-    """Test ERROR log demo endpoint."""
-    response = client.get("/demo/error")
+    response = await aclient.get("/demo/all")
+    # External API in /demo/all might fail, but endpoint should still return 200
     assert response.status_code == 200
     data = response.json()
-    assert "ERROR log" in data["message"]
-    assert data["error_logged"] is True
-
-
-def test_demo_exception_runtime():
-    """Test exception endpoint with runtime error."""
-    response = client.get("/demo/exception?error_type=runtime")
-    assert response.status_code == 500
-    assert "error" in response.json()["detail"].lower()
-
-
-def test_demo_exception_http():
-    """Test exception endpoint with HTTP error."""
-    response = client.get("/demo/exception?error_type=http")
-    assert response.status_code == 503
+    assert "telemetry_generated" in data
+    assert "total_types" in data
+    assert len(data["telemetry_generated"]) > 0
 
 
-def test_demo_exception_zero_division():
-    """Test exception endpoint with zero division error."""
-    response = client.get("/demo/exception?error_type=zero_division")
-    assert response.status_code == 500
+async def test_all_demo_routes_registered(app_instance):
+    """Test every demo endpoint is registered on the app."""
+    paths = {route.path for route in app_instance.routes}
+    expected = {
+        "/demo/info",
+        "/demo/warning",
+        "/demo/error",
+        "/demo/exception",
+        "/demo/metrics",
+        "/demo/trace",
+        "/demo/dependency",
+        "/demo/slow",
+        "/demo/all",
+    }
+    assert expected <= paths
 
 
-def test_demo_metrics():
-    """Test custom metrics endpoint."""
-    response = client.get("/demo/metrics")
-    assert response.status_code == 200
-    data = response.json()
-    assert "metrics" in data
-    assert "request_count" in data["metrics"]
-    assert "processing_time_ms" in data["metrics"]
+async def test_demo_log_endpoints_concurrently(aclient):
+    """Telemetry-emitting endpoints can be served concurrently on one event loop."""
+    paths = ["/demo/info", "/demo/warning", "/demo/error", "/demo/metrics", "/demo/trace"]
+    responses = await asyncio.gather(*(aclient.get(path) for path in paths))
+    assert [r.status_code for r in responses] == [200] * len(paths)
 
 
-def test_demo_custom_trace():
-    """Test custom trace endpoint."""
-    response = client.get("/demo/trace")
-    assert response.status_code == 200
-    assert "Custom trace" in response.json()["message"]
+async def test_health_reports_failed_telemetry_setup(monkeypatch, caplog):
+    """A failing telemetry setup is logged right away and turns /health to 503."""
+    from fastapi import FastAPI
 
+    from app import main
 
-def test_demo_dependency_tracking():
-    """Test dependency tracking endpoint."""
-    response = client.get("/demo/dependency")
-    # External API might fail, so we accept both 200 and 502
-    assert response.status_code in [200, 502]
-    if response.status_code == 200:
-        data = response.json()
-        assert "external_api" in data
-        assert data["external_api"] == "jsonplaceholder.typicode.com"
+    def broken_setup(app):
+        raise RuntimeError("exporter unavailable")
 
+    monkeypatch.setattr(main, "setup_telemetry", broken_setup)
+    app = FastAPI(lifespan=main.lifespan)
+    app.add_api_route("/health", main.health)
 
-def test_demo_slow_operation():
-    """Test slow operation endpoint."""
-    response = client.get("/demo/slow")
-    assert response.status_code == 200
-    data = response.json()
-    assert "duration_seconds" in data
-    assert data["duration_seconds"] > 0
-
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        await app.state.telemetry_task
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            response = await c.get("/health")
 
-def test_demo_all_telemetry():
-    """Test comprehensive demo endpoint that generates all telemetry types."""
-    response = client.get("/demo/all")
-    # External API in /demo/all might fail, but endpoint should still return 200
-    assert response.status_code == 200
-    data = response.json()
-    assert "telemetry_generated" in data
-    assert "total_types" in data
-    assert len(data["telemetry_generated"]) > 0
+    assert response.status_code == 503
+    assert response.json() == {"status": "unhealthy", "reason": "telemetry setup failed"}
+    [record] = [r for r in caplog.records if r.name == "app.main" and r.levelno == logging.ERROR]
+    assert "OpenTelemetry setup failed" in record.getMessage()
+    assert str(record.exc_info[1]) == "exporter unavailable"
+
+
+async def test_invalid_settings_fail_startup(monkeypatch):
+    """A configuration error stops startup instead of posing as a telemetry failure."""
+    from fastapi import FastAPI
+
+    from app import main
+    from app.config import get_settings
+
+    monkeypatch.setenv("OTEL_ENABLED", "ture")
+    get_settings.cache_clear()
+    try:
+        app = FastAPI(lifespan=main.lifespan)
+        with pytest.raises(ValueError, match="ture"):
+            async with app.router.lifespan_context(app):
+                pass
+    finally:
+        monkeypatch.undo()
+        get_settings.cache_clear()
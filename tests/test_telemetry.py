@@ -0,0 +1,86 @@
+import io
+import logging
+
+import httpx
+import pytest
+
+DUMMY_CONNECTION_STRING = (
+    "InstrumentationKey=00000000-0000-0000-0000-000000000000;"
+    "IngestionEndpoint=http://127.0.0.1:9/"
+)
+
+
+@pytest.fixture
+def span_exporter(monkeypatch):
+    """Enable telemetry with a dummy connection string, exporting spans in memory.
+
+    OTel providers can only be set once per process, so this test owns the
+    global tracer provider for the rest of the session; the root log handler,
+    httpx instrumentation and cached settings are restored afterwards. The
+    app and SDK are imported here so collection stays light.
+    """
+    from azure.monitor.opentelemetry.exporter import (
+        AzureMonitorLogExporter,
+        AzureMonitorMetricExporter,
+        AzureMonitorTraceExporter,
+    )
+    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+    from opentelemetry.sdk._logs.export import InMemoryLogExporter
+    from opentelemetry.sdk.metrics.export import ConsoleMetricExporter
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    from app import telemetry
+    from app.config import get_settings
+
+    monkeypatch.setenv("OTEL_ENABLED", "true")
+    monkeypatch.setenv("APPLICATIONINSIGHTS_CONNECTION_STRING", DUMMY_CONNECTION_STRING)
+    monkeypatch.setattr(telemetry, "_telemetry_configured", False)
+    get_settings.cache_clear()
+
+    exporter = InMemorySpanExporter()
+    monkeypatch.setattr(AzureMonitorTraceExporter, "from_connection_string", lambda *a, **kw: exporter)
+    monkeypatch.setattr(
+        AzureMonitorMetricExporter, "from_connection_string",
+        lambda *a, **kw: ConsoleMetricExporter(out=io.StringIO()),
+    )
+    monkeypatch.setattr(
+        AzureMonitorLogExporter, "from_connection_string", lambda *a, **kw: InMemoryLogExporter()
+    )
+
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield exporter
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    HTTPXClientInstrumentor().uninstrument()
+    get_settings.cache_clear()
+
+
+async def test_late_instrumentation_produces_server_spans(span_exporter):
+    """setup_telemetry runs in a worker thread after the middleware stack is built."""
+    from fastapi import FastAPI
+    from opentelemetry import trace
+    from opentelemetry.trace import SpanKind
+
+    from app.main import lifespan
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # Build the middleware stack before setup, as a real server's startup does
+        assert (await client.get("/ping")).status_code == 200
+        async with app.router.lifespan_context(app):
+            await app.state.telemetry_task
+            assert not app.state.telemetry_failed
+            assert (await client.get("/ping")).status_code == 200
+
+    trace.get_tracer_provider().force_flush()
+    server_spans = [
+        span for span in span_exporter.get_finished_spans() if span.kind == SpanKind.SERVER
+    ]
+    assert [span.name for span in server_spans] == ["GET /ping"]